@@ -13,24 +13,146 @@ Supports:
 - TESLA 4000 (ERL) - Power System Recorder
 """
 
+import functools
+import io
 import json
+import mmap
 import re
 import zipfile
 import sys
 import os
+import queue
 import threading
+import multiprocessing
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Tuple
+from enum import Enum
+from typing import Callable, Iterator, List, Optional, Dict, Tuple, Union
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# REGEX PATTERNS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Metadata (substation / bay / voltage / switchgear)
+_SE_PAT1 = re.compile(r'SUBESTACI.N\s*:\s*(?:S\.E\.\s+)?([A-Z][A-Z\s]+)\s+\d+(?:/\d+)*\s*kV', re.IGNORECASE)
+_SE_PAT2 = re.compile(r'SUBESTACI.N\s*:\s*(?:S\.E\.\s+)?([^\n]+)', re.IGNORECASE)
+_SE_PAT3 = re.compile(r'(?:T.TULO|AMPLIACI.N)\s*[:\s]*(?:S\.E\.\s+)?([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]+?)\s+\d+', re.IGNORECASE)
+_SE_KV_SUFFIX_PAT = re.compile(r'\s+[\d./]+\s*kV\s*$', re.IGNORECASE)
+_BAY_LINE_PAT = re.compile(r'\b(L-[A-Z0-9-]+)\b')
+_BAY_NAME_PAT = re.compile(r'BAH.A\s+([A-ZÁÉÍÓÚÑ]+(?:\s+[A-ZÁÉÍÓÚÑ]+)*)', re.IGNORECASE)
+_BAY_TR_PAT = re.compile(r'\b(TR-\d+)\b')
+_VOLTAGE_PAT = re.compile(r'(?:L[IÍ]NEA|TABLERO)?\s*(\d+)\s*kV', re.IGNORECASE)
+_VOLTAGE_MULTI_PAT = re.compile(r'\b(\d+/\d+(?:/\d+)?)\s*kV')
+_SWITCHGEAR_PAT = re.compile(r'[=]?(F\.Q\d+\.CP\d+)')
+
+# Bill of materials / device identification
+_MODEL_PAT = re.compile(r'(PCS-[\w-]+|TESLA\s*\d[\w_]*|SEL-[\w-]+|UDF-[\w-]+)', re.IGNORECASE)
+_SYMBOL_PAT = re.compile(r'(-[A-Z]\d+\w*(?:;-[A-Z]\d+\w*)*)')
+_TITLE_DEVICE_PAT = re.compile(r'(?:Entradas|Salidas)\s+Binarias\s+de\s+(-[A-Z]\d+\w*)')
+_TITLE_DEVICE_FULL_PAT = re.compile(r'(-[A-Z]\d+\w*)\s*\(([^)]+)\)\s*:\s*([^-\n]+?)\s*-\s*(?:Entradas|Salidas)\s+Binarias')
+_DEVICE_PATTERNS = [
+    (re.compile(r'(-F\d+)\s*\((PCS-931S)\)'), 'PCS-931S'),
+    (re.compile(r'(-F\d+)\s*\((SEL-411L)\)'), 'SEL-411L'),
+    (re.compile(r'(-C\d+)\s*\((PCS-9705S)\)'), 'PCS-9705S'),
+    (re.compile(r'(-C\d+)\s*\((UDF-506)\)'), 'UDF-506'),
+]
+
+# Binary input tokens
+_BI_PAT = re.compile(r'BI_(\d+)')
+_IN_PAT = re.compile(r'IN(\d+)')
+_BI_WORD_PAT = re.compile(r'^BI_(\d+)$')
+_SLOT_WORD_PAT = re.compile(r'SLOT:(.+)')
+_B_SLOT_WORD_PAT = re.compile(r'B\d{2}$')
+_LETTER_PAT = re.compile(r'^[A-H]$')
+_BOARD_PAT = re.compile(r'(B\d{2}|P\d{1,2})\s+\d{2}')
+_COLUMNAR_TITLE_PAT = re.compile(r'Circuito de Entradas Binarias de\s+-[A-Z]\d+')
+_SLOT_PAT = re.compile(r'SLOT:\w+')
+
+# Columnar description parsing
+# Terminal refs (/1.2 F12), terminal strips (-X1), board rows (B01 01) and column letters (A B ...)
+_SKIP_LINE_PAT = re.compile(r'^(?:[/\d\.\-]+[A-H]?\s*F\d+|-X\d+|[BP]\d+\s+\d+|[A-H]\s+[A-H])')
+_STARTERS = [r'Interruptor\s*=', r'Secc\.\s+(?:Línea|PAT|Tierra|Bypass|Puesta|Barra)', r'Posici[oó]n\s+(?:Cerrado|Abierto|cerrado|abierto)', r'En\s+posición\s+(?:Activado|Desactivado)', r'Selector\s+(?:L/R|en\s+(?:remoto|local|desconectado))', r'Disparo\s+(?:por|Fase|Protec)', r'SF6\s+Bloqueo', r'Bloqueo\s+SF6', r'Falla\s+(?:MCB|Interna|Carga|canal|alimentación|de\s+equipo)', r'Reserva', r'Manivela\s+(?:Insertada|insertada)', r'Alarma', r'Señal(?:ización)?', r'Nivel\s+(?:de\s+)?(?:Aceite|Temperatura)?', r'Temperatura', r'Buchholz', r'Sobrepresión', r'Relé\s+(?:de\s+Bloqueo|F\d+|K\d+)', r'Protec\.', r'Bloqueo\s+(?:activado|por)', r'Cierre\s+Manual', r'Recepción\s+Teleprotección', r'Transmisión', r'OLTC', r'Ventilador', r'Cuba', r'Registrador\s+de\s+(?:Fallas|fallas)', r'Medidor\s+(?:de\s+Energía|M\d+)', r'Iluminación,', r'--?\d*TT-', r'Controlador\s+de\s+Bahía', r'Mando\s+Sincronizado', r'Alim\.\s+', r'Equipos\s+Secundarios', r'Regulador\s+de\s+Tensión', r'IN\d+-\d+', r'Función\s+\d+', r'Discordancia', r'Resorte\s+descargado', r'K86\s+Relé', r'50BF\s+Arranque', r'Otros\s+seccionadores', r'74\s+Falla', r'Alimentación\s+\d+']
+_COL_DESC_PAT = re.compile('|'.join(f'({s})' for s in _STARTERS), re.IGNORECASE)
+
+# File handling
+_ZIP_PAGE_PAT = re.compile(r'page[_-]?(\d+)', re.IGNORECASE)
+_ZIP_READ_BUFFER = 32 * 1024
+_SHEET_NAME_PAT = re.compile(r'[\\/*?:\[\]]')
+
+
+@functools.lru_cache(maxsize=256)
+def _func_pat_for(device_tag: str) -> re.Pattern:
+    """Compiled '<tag> (<model>): <function>' pattern, built once per device tag."""
+    return re.compile(rf'{re.escape(device_tag)}\s*\([^)]+\):\s*([^-\n]+)')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LAZY IMPORTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_pdfplumber = None
+_openpyxl = None
+_xlsxwriter = None
+_pymupdf = None
+
+
+def _get_pdfplumber():
+    global _pdfplumber
+    if _pdfplumber is None:
+        import pdfplumber
+        _pdfplumber = pdfplumber
+    return _pdfplumber
+
+
+def _get_pymupdf():
+    global _pymupdf
+    if _pymupdf is None:
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+        _pymupdf = pymupdf
+    return _pymupdf
+
+
+def _get_openpyxl():
+    global _openpyxl
+    if _openpyxl is None:
+        import openpyxl
+        import openpyxl.cell
+        import openpyxl.styles
+        import openpyxl.utils
+        _openpyxl = openpyxl
+    return _openpyxl
+
+
+def _get_xlsxwriter():
+    global _xlsxwriter
+    if _xlsxwriter is None:
+        import xlsxwriter
+        _xlsxwriter = xlsxwriter
+    return _xlsxwriter
+
+
+def _has_xlsxwriter() -> bool:
+    try:
+        _get_xlsxwriter()
+        return True
+    except ImportError:
+        return False
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class BinaryInput:
     device: str
     device_model: str
@@ -48,10 +170,43 @@ class BinaryInput:
     switchgear: Optional[str] = None
 
 
+class PageKind(Enum):
+    SKIP = 'skip'
+    COLUMNAR_BI = 'columnar_bi'
+    PCS9705S = 'PCS-9705S'
+    PCS931S = 'PCS-931S'
+    SEL411L = 'SEL-411L'
+    BI_OTHER = 'bi_other'
+    IN_OTHER = 'in_other'
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # EXTRACTOR CLASS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _text_from_words(words: List[dict], y_tolerance: float = 3, x_tolerance: float = 3) -> str:
+    """Rebuild page text from positioned words, one line per cluster of tops, like pdfplumber's extract_text."""
+    lines, current, last_top = [], [], None
+    for w in sorted(words, key=lambda w: w['top']):
+        if last_top is not None and w['top'] - last_top > y_tolerance:
+            lines.append(current)
+            current = []
+        current.append(w)
+        last_top = w['top']
+    if current:
+        lines.append(current)
+    out = []
+    for line in lines:
+        parts, prev_x1 = [], None
+        for w in sorted(line, key=lambda w: w['x0']):
+            if prev_x1 is not None and w['x0'] - prev_x1 > x_tolerance:
+                parts.append(' ')
+            parts.append(w['text'])
+            prev_x1 = w['x1']
+        out.append(''.join(parts))
+    return '\n'.join(out)
+
+
 class BinaryInputExtractor:
     PATTERNS = {
         'PCS-931S': {'input_id': r'BI_(\d+)', 'name': 'NR Electric PCS-931S'},
@@ -62,26 +217,52 @@ class BinaryInputExtractor:
         'PCS-915SD': {'input_id': r'BI_(\d+)', 'name': 'NR Electric PCS-915SD Bus Protection Relay'},
     }
 
-    def __init__(self, file_path: str):
+    FUNCTION_KEYWORDS = {
+        'UNIDAD DE CONTROL': 'Unidad de Control de Bahía',
+        'CONTROLADOR': 'Controlador de Bahía',
+        'RELÉ DIFERENCIAL': 'Relé Diferencial de Línea',
+        'RELÉ DE BARRA': 'Relé de Barra',
+        'GRABADOR': 'Grabador de Fallas',
+        'REGISTRADOR': 'Registrador de Fallas',
+        'MEDIDOR': 'Medidor Multifunción',
+        'Módulo de Corrientes': 'Grabador de Fallas (Corrientes)',
+        'Módulo de voltajes': 'Grabador de Fallas (Voltajes)',
+    }
+    _FUNC_KW_UPPER = [(kw.upper(), func) for kw, func in FUNCTION_KEYWORDS.items()]
+    BACKENDS = ('pdfplumber', 'pdfminer', 'pymupdf')
+    _PROGRESS_EVERY = 8
+
+    def __init__(self, file_path: str, backend: str = 'pdfplumber'):
         self.file_path = file_path
+        self.backend = backend
         self.texts: Dict[int, str] = {}
         self.file_type = None
         self.device_model_map: Dict[str, str] = {}
         self.device_function_map: Dict[str, str] = {}
+        self._page_kinds: Dict[int, PageKind] = {}
+        self._page_words: Dict[int, List[dict]] = {}
+        self._page_widths: Dict[int, float] = {}
+        self._device_info: Dict[str, Tuple[str, str, str]] = {}
         self._pdf = None
+        self._pdf_map = None
+        self._words_preloaded = False
+        self._progress_cb: Optional[Callable[[int, int], None]] = None
         self.substation = None
         self.bay = None
         self.voltage_level = None
         self.switchgear = None
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{backend}'. Choose one of: {', '.join(self.BACKENDS)}")
 
     def load_archive(self) -> bool:
         try:
             with open(self.file_path, 'rb') as f:
                 header = f.read(8)
-            if header[:4] == b'PK\x03\x04':
-                self.file_type = 'zip'
-                return self._load_zip_archive()
-            elif header[:5] == b'%PDF-':
+                if header[:4] == b'PK\x03\x04':
+                    self.file_type = 'zip'
+                    f.seek(0)
+                    return self._load_zip_archive(f)
+            if header[:5] == b'%PDF-':
                 self.file_type = 'pdf'
                 return self._load_pdf_file()
             else:
@@ -90,113 +271,206 @@ class BinaryInputExtractor:
             print(f"Error loading file: {e}")
             return False
 
-    def _load_zip_archive(self) -> bool:
+    def _load_zip_archive(self, source=None) -> bool:
         try:
-            with zipfile.ZipFile(self.file_path, 'r') as zf:
+            with zipfile.ZipFile(source if source is not None else self.file_path, 'r') as zf:
                 txt_files = [f for f in zf.namelist() if f.endswith('.txt')]
                 for txt_file in txt_files:
-                    match = re.search(r'page[_-]?(\d+)', txt_file, re.IGNORECASE)
+                    match = _ZIP_PAGE_PAT.search(txt_file)
                     if match:
                         page_num = int(match.group(1))
-                        content = zf.read(txt_file).decode('utf-8', errors='ignore')
-                        self.texts[page_num] = content
+                        with zf.open(txt_file) as raw, io.TextIOWrapper(io.BufferedReader(raw, buffer_size=_ZIP_READ_BUFFER), encoding='utf-8', errors='ignore', newline='') as tr:
+                            self.texts[page_num] = tr.read()
+                if not self.texts:
+                    pdf_files = sorted(f for f in zf.namelist() if f.lower().endswith('.pdf'))
+                    if pdf_files:
+                        self._load_zip_pdfs(zf, pdf_files)
+                        self._extract_metadata()
             return len(self.texts) > 0
+        except ImportError as e:
+            package = 'pymupdf' if self.backend == 'pymupdf' else 'pdfplumber'
+            raise ImportError(f"{package} not installed. Install with: pip install {package}") from e
         except Exception as e:
             print(f"Error loading ZIP: {e}")
             return False
 
+    def _load_zip_pdfs(self, zf: zipfile.ZipFile, pdf_files: List[str]):
+        """Parse PDF members from memory, numbering pages on from the previous member."""
+        self._words_preloaded = True
+        first_page = 1
+        for name in pdf_files:
+            data = zf.read(name)
+            if self.backend == 'pymupdf':
+                with _get_pymupdf().open(stream=data, filetype='pdf') as doc:
+                    self._load_pymupdf_pages(doc, first_page)
+                    first_page += doc.page_count
+            else:
+                with _get_pdfplumber().open(io.BytesIO(data)) as pdf:
+                    self._load_pdfplumber_pages(pdf, first_page)
+                    first_page += len(pdf.pages)
+
     def _load_pdf_file(self) -> bool:
         try:
-            import pdfplumber
-            self._pdf = pdfplumber.open(self.file_path)
-            for i, page in enumerate(self._pdf.pages):
-                text = page.extract_text() or ''
-                if text.strip():
-                    self.texts[i + 1] = text
+            if self.backend == 'pymupdf':
+                self._words_preloaded = True
+                with _get_pymupdf().open(self.file_path) as doc:
+                    self._load_pymupdf_pages(doc)
+            else:
+                self._pdf_map = self._map_file(self.file_path)
+                self._pdf = _get_pdfplumber().open(self._pdf_map)
+                if self.backend == 'pdfminer':
+                    self._load_pdfminer_texts()
+                else:
+                    self._load_pdfplumber_pages(self._pdf)
             self._extract_metadata()
             return len(self.texts) > 0
-        except ImportError:
-            raise ImportError("pdfplumber not installed. Install with: pip install pdfplumber")
+        except ImportError as e:
+            package = 'pymupdf' if self.backend == 'pymupdf' else 'pdfplumber'
+            raise ImportError(f"{package} not installed. Install with: pip install {package}") from e
         except Exception as e:
             print(f"Error loading PDF: {e}")
             return False
 
+    @staticmethod
+    def _map_file(path: str) -> mmap.mmap:
+        """Read-only memory mapping of a PDF file."""
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _report_page(self, done: int, total: int):
+        if self._progress_cb is not None and (done % self._PROGRESS_EVERY == 0 or done == total):
+            self._progress_cb(done, total)
+
+    def _load_pdfplumber_pages(self, pdf, first_page: int = 1):
+        total = len(pdf.pages)
+        for page_num, page in enumerate(pdf.pages, first_page):
+            text = page.extract_text() or ''
+            if text.strip():
+                self.texts[page_num] = text
+                kind = self._classify_page(page_num, text)
+                self._page_kinds[page_num] = kind
+                if kind in (PageKind.COLUMNAR_BI, PageKind.BI_OTHER):
+                    self._page_words[page_num] = self._extract_page_words(page)
+                    self._page_widths[page_num] = page.width
+            page.flush_cache()
+            self._report_page(page_num - first_page + 1, total)
+
+    def _load_pdfminer_texts(self):
+        """Faster text pass over raw pdfminer characters, skipping its layout analysis."""
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LTChar, LTContainer
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        resources = PDFResourceManager()
+        device = PDFPageAggregator(resources, laparams=None)
+        interpreter = PDFPageInterpreter(resources, device)
+        # Separate mapping: pdfminer keeps its own file position
+        total = len(self._pdf.pages) if self._progress_cb is not None else 0
+        with self._map_file(self.file_path) as fp:
+            for page_num, page in enumerate(PDFPage.get_pages(fp), 1):
+                interpreter.process_page(page)
+                layout = device.get_result()
+                chars = [{'text': c.get_text(), 'x0': c.x0, 'x1': c.x1, 'top': layout.y1 - c.y1} for c in self._iter_layout_chars(layout, LTChar, LTContainer)]
+                text = _text_from_words(chars)
+                if text.strip():
+                    self.texts[page_num] = text
+                    self._page_kinds[page_num] = self._classify_page(page_num, text)
+                self._report_page(page_num, total)
+
+    @staticmethod
+    def _iter_layout_chars(container, char_type, container_type):
+        # Form XObject text is nested in LTFigure
+        for obj in container:
+            if isinstance(obj, char_type):
+                yield obj
+            elif isinstance(obj, container_type):
+                yield from BinaryInputExtractor._iter_layout_chars(obj, char_type, container_type)
+
+    def _load_pymupdf_pages(self, doc, first_page: int = 1):
+        """MuPDF pass: text spans become pdfplumber-style word dicts, and page text is rebuilt from them."""
+        total = doc.page_count
+        for page_num, page in enumerate(doc, first_page):
+            words = [{'text': span['text'], 'x0': span['bbox'][0], 'x1': span['bbox'][2], 'top': span['bbox'][1]}
+                     for block in page.get_text('dict')['blocks'] for line in block.get('lines', ())
+                     for span in line['spans'] if span['text'].strip()]
+            text = _text_from_words(words)
+            if text.strip():
+                self.texts[page_num] = text
+                kind = self._classify_page(page_num, text)
+                self._page_kinds[page_num] = kind
+                if kind in (PageKind.COLUMNAR_BI, PageKind.BI_OTHER):
+                    self._page_words[page_num] = words
+                    self._page_widths[page_num] = page.rect.width
+            self._report_page(page_num - first_page + 1, total)
+
+    @property
+    def _has_word_positions(self) -> bool:
+        return self._pdf is not None or self._words_preloaded
+
     def _extract_metadata(self):
         for page_num in range(1, min(4, len(self.texts) + 1)):
             text = self.texts.get(page_num, '')
             
             if not self.substation:
-                se_match = re.search(r'SUBESTACI.N\s*:\s*(?:S\.E\.\s+)?([A-Z][A-Z\s]+)\s+\d+(?:/\d+)*\s*kV', text, re.IGNORECASE)
+                se_match = _SE_PAT1.search(text)
                 if not se_match:
-                    se_match = re.search(r'SUBESTACI.N\s*:\s*(?:S\.E\.\s+)?([^\n]+)', text, re.IGNORECASE)
+                    se_match = _SE_PAT2.search(text)
                 if not se_match:
-                    se_match = re.search(r'(?:T.TULO|AMPLIACI.N)\s*[:\s]*(?:S\.E\.\s+)?([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]+?)\s+\d+', text, re.IGNORECASE)
+                    se_match = _SE_PAT3.search(text)
                 if se_match:
                     self.substation = se_match.group(1).strip()
             
             if not self.bay:
-                bay_match = re.search(r'\b(L-[A-Z0-9-]+)\b', text)
+                bay_match = _BAY_LINE_PAT.search(text)
                 if bay_match:
                     self.bay = bay_match.group(1)
                 else:
-                    bay_match = re.search(r'BAH.A\s+([A-ZÁÉÍÓÚÑ]+(?:\s+[A-ZÁÉÍÓÚÑ]+)*)', text, re.IGNORECASE)
+                    bay_match = _BAY_NAME_PAT.search(text)
                     if bay_match:
                         self.bay = bay_match.group(1).strip()
                     else:
-                        bay_match = re.search(r'\b(TR-\d+)\b', text)
+                        bay_match = _BAY_TR_PAT.search(text)
                         if bay_match:
                             self.bay = bay_match.group(1)
             
             if not self.voltage_level:
-                voltage_match = re.search(r'(?:L[IÍ]NEA|TABLERO)?\s*(\d+)\s*kV', text, re.IGNORECASE)
+                voltage_match = _VOLTAGE_PAT.search(text)
                 if voltage_match:
                     self.voltage_level = voltage_match.group(1) + " kV"
                 else:
-                    voltage_match2 = re.search(r'\b(\d+/\d+(?:/\d+)?)\s*kV', text)
+                    voltage_match2 = _VOLTAGE_MULTI_PAT.search(text)
                     if voltage_match2:
                         voltages = voltage_match2.group(1).split('/')
                         self.voltage_level = voltages[0] + " kV"
             
             if not self.switchgear:
-                sw_match = re.search(r'[=]?(F\.Q\d+\.CP\d+)', text)
+                sw_match = _SWITCHGEAR_PAT.search(text)
                 if sw_match:
                     self.switchgear = sw_match.group(1)
         
         if self.substation:
             self.substation = ' '.join(self.substation.split())
-            self.substation = re.sub(r'\s+[\d./]+\s*kV\s*$', '', self.substation, flags=re.IGNORECASE)
+            self.substation = _SE_KV_SUFFIX_PAT.sub('', self.substation)
 
     def _build_device_maps(self):
-        model_pat = re.compile(r'(PCS-[\w-]+|TESLA\s*\d[\w_]*|SEL-[\w-]+|UDF-[\w-]+)', re.IGNORECASE)
-        sym_pat = re.compile(r'(-[A-Z]\d+\w*(?:;-[A-Z]\d+\w*)*)')
-        func_kw = {
-            'UNIDAD DE CONTROL': 'Unidad de Control de Bahía',
-            'CONTROLADOR': 'Controlador de Bahía',
-            'RELÉ DIFERENCIAL': 'Relé Diferencial de Línea',
-            'RELÉ DE BARRA': 'Relé de Barra',
-            'GRABADOR': 'Grabador de Fallas',
-            'REGISTRADOR': 'Registrador de Fallas',
-            'MEDIDOR': 'Medidor Multifunción',
-            'Módulo de Corrientes': 'Grabador de Fallas (Corrientes)',
-            'Módulo de voltajes': 'Grabador de Fallas (Voltajes)',
-        }
         for page_num, text in self.texts.items():
             if 'Lista de Materiales' not in text:
                 continue
             if 'Accesorios' in text:
                 continue
             for line in text.split('\n'):
-                if 'SÍMBOLO' in line or 'DESCRIPCIÓN' in line:
+                if '-' not in line or 'SÍMBOLO' in line or 'DESCRIPCIÓN' in line:
                     continue
-                sm = sym_pat.search(line)
-                mm = model_pat.search(line)
+                sm = _SYMBOL_PAT.search(line)
+                mm = _MODEL_PAT.search(line)
                 if sm and mm:
                     symbols_str = sm.group(1)
                     model = mm.group(1).strip()
                     between = line[sm.end():mm.start()].strip()
                     function = between
-                    for kw, func in func_kw.items():
-                        if kw.upper() in between.upper():
+                    between_upper = between.upper()
+                    for kw, func in self._FUNC_KW_UPPER:
+                        if kw in between_upper:
                             function = func
                             break
                     for sym in symbols_str.split(';'):
@@ -205,7 +479,7 @@ class BinaryInputExtractor:
                         self.device_function_map[sym] = function
 
     def _extract_device_from_page_title(self, text: str) -> Optional[Tuple[str, str, str]]:
-        m = re.search(r'(?:Entradas|Salidas)\s+Binarias\s+de\s+(-[A-Z]\d+\w*)', text)
+        m = _TITLE_DEVICE_PAT.search(text)
         if m:
             device = m.group(1)
             model, function = '', ''
@@ -214,7 +488,7 @@ class BinaryInputExtractor:
                 function = self.device_function_map.get(device, '')
             return (device, model, function)
         
-        m = re.search(r'(-[A-Z]\d+\w*)\s*\(([^)]+)\)\s*:\s*([^-\n]+?)\s*-\s*(?:Entradas|Salidas)\s+Binarias', text)
+        m = _TITLE_DEVICE_FULL_PAT.search(text)
         if m:
             return (m.group(1), m.group(2).strip(), m.group(3).strip())
         
@@ -226,58 +500,72 @@ class BinaryInputExtractor:
         return device_tag, model, function
 
     def detect_device_type(self, text: str) -> Tuple[str, str, str]:
-        patterns = [
-            (r'(-F\d+)\s*\((PCS-931S)\)', 'PCS-931S'),
-            (r'(-F\d+)\s*\((SEL-411L)\)', 'SEL-411L'),
-            (r'(-C\d+)\s*\((PCS-9705S)\)', 'PCS-9705S'),
-            (r'(-C\d+)\s*\((UDF-506)\)', 'UDF-506'),
-        ]
-        for pattern, model in patterns:
-            match = re.search(pattern, text)
+        cached = self._device_info.get(text)
+        if cached is not None:
+            return cached
+        result = ("", "", "")
+        for pattern, model in _DEVICE_PATTERNS:
+            if model not in text:
+                continue
+            match = pattern.search(text)
             if match:
                 device_tag = match.group(1)
-                func_match = re.search(rf'{re.escape(device_tag)}\s*\([^)]+\):\s*([^-\n]+)', text)
+                func_match = _func_pat_for(device_tag).search(text)
                 function = func_match.group(1).strip() if func_match else ""
-                return device_tag, model, function
-        return "", "", ""
+                result = (device_tag, model, function)
+                break
+        self._device_info[text] = result
+        return result
 
     def extract_device_info(self, text: str) -> Tuple[str, str, str]:
         return self.detect_device_type(text)
 
+    @staticmethod
+    def _extract_page_words(page) -> List[dict]:
+        return page.extract_words(keep_blank_chars=True, x_tolerance=3, y_tolerance=3)
+
     def _extract_bi_from_word_positions(self, page_num: int) -> List[BinaryInput]:
-        if self._pdf is None:
-            return []
-        page = self._pdf.pages[page_num - 1]
-        words = page.extract_words(keep_blank_chars=True, x_tolerance=3, y_tolerance=3)
+        words = self._page_words.get(page_num)
+        if words is None:
+            if self._pdf is None:
+                return []
+            page = self._pdf.pages[page_num - 1]
+            words = self._page_words[page_num] = self._extract_page_words(page)
+            self._page_widths[page_num] = page.width
+            page.flush_cache()
         if not words:
             return []
 
-        bi_words = []
+        desc_y_max = 70
+        bi_words, desc_words, slot_candidates = [], [], []
         for w in words:
-            m = re.match(r'^BI_(\d+)$', w['text'])
+            raw = w['text']
+            m = _BI_WORD_PAT.match(raw)
             if m:
                 bi_words.append({'number': int(m.group(1)), 'x0': w['x0'], 'x1': w['x1'], 'top': w['top']})
+            if _SLOT_WORD_PAT.match(raw) or _B_SLOT_WORD_PAT.match(raw):
+                slot_candidates.append((raw, w['top']))
+            if w['top'] < desc_y_max:
+                t = raw.strip()
+                if len(t) > 1 and not _LETTER_PAT.match(t) and 'P.Met' not in raw:
+                    desc_words.append(w)
         if not bi_words:
             return []
 
         bi_words.sort(key=lambda w: w['x0'])
-        seen = set()
-        unique_bi = []
+        unique_bi = {}
         for bw in bi_words:
-            if bw['number'] not in seen:
-                seen.add(bw['number'])
-                unique_bi.append(bw)
-        bi_words = unique_bi
+            unique_bi.setdefault(bw['number'], bw)
+        bi_words = list(unique_bi.values())
 
+        page_width = self._page_widths[page_num]
         columns = []
         for i, bw in enumerate(bi_words):
             center = (bw['x0'] + bw['x1']) / 2
             left = 0 if i == 0 else ((bi_words[i-1]['x0'] + bi_words[i-1]['x1']) / 2 + center) / 2
-            right = page.width if i == len(bi_words) - 1 else (center + (bi_words[i+1]['x0'] + bi_words[i+1]['x1']) / 2) / 2
+            right = page_width if i == len(bi_words) - 1 else (center + (bi_words[i+1]['x0'] + bi_words[i+1]['x1']) / 2) / 2
             columns.append({'bi_number': bw['number'], 'left': left, 'right': right, 'center': center, 'bi_top': bw['top']})
 
-        desc_y_max = 70
-        desc_words = [w for w in words if w['top'] < desc_y_max and len(w['text'].strip()) > 1 and not re.match(r'^[A-H]$', w['text'].strip()) and 'P.Met' not in w['text']]
         y_levels = sorted(set(round(w['top'], 0) for w in desc_words))
         lines = []
         used_y = set()
@@ -288,17 +576,17 @@ class BinaryInputExtractor:
             if line_words:
                 for w in line_words:
                     used_y.add(round(w['top'], 0))
-                lines.append(sorted(line_words, key=lambda w: w['x0']))
+                lines.append([((w['x0'] + w['x1']) / 2, w['x0'], ' '.join(w['text'].split())) for w in sorted(line_words, key=lambda w: w['x0'])])
 
         col_descriptions = {}
         for col in columns:
             bi_num = col['bi_number']
+            lo, hi = col['left'] - 20, col['right'] + 20
             desc_parts = []
             for line_words in lines:
-                col_words = [w for w in line_words if (col['left'] - 20 <= (w['x0'] + w['x1']) / 2 <= col['right'] + 20) or (col['left'] - 20 <= w['x0'] <= col['right'] + 20)]
+                col_words = [t for center, x0, t in line_words if lo <= center <= hi or lo <= x0 <= hi]
                 if col_words:
-                    text = ' '.join(w['text'].strip() for w in col_words)
-                    text = re.sub(r'\s+', ' ', text).strip()
+                    text = ' '.join(col_words)
                     if text:
                         desc_parts.append(text)
             if desc_parts:
@@ -306,14 +594,6 @@ class BinaryInputExtractor:
 
         slot = None
         bi_top = min(c['bi_top'] for c in columns)
-        slot_candidates = []
-        for w in words:
-            m = re.match(r'SLOT:(.+)', w['text'])
-            if m:
-                slot_candidates.append((w['text'], w['top']))
-            m = re.match(r'B\d{2}$', w['text'])
-            if m:
-                slot_candidates.append((w['text'], w['top']))
         if slot_candidates:
             below_bi = [(s, t) for s, t in slot_candidates if t <= bi_top + 5]
             slot = max(below_bi, key=lambda x: x[1])[0] if below_bi else slot_candidates[0][0]
@@ -344,25 +624,23 @@ class BinaryInputExtractor:
     def parse_columnar_descriptions(self, text: str, bi_numbers: List[int]) -> Dict[int, str]:
         lines = text.split('\n')
         descriptions = {}
-        starters = [r'Interruptor\s*=', r'Secc\.\s+(?:Línea|PAT|Tierra|Bypass|Puesta|Barra)', r'Posici[oó]n\s+(?:Cerrado|Abierto|cerrado|abierto)', r'En\s+posición\s+(?:Activado|Desactivado)', r'Selector\s+(?:L/R|en\s+(?:remoto|local|desconectado))', r'Disparo\s+(?:por|Fase|Protec)', r'SF6\s+Bloqueo', r'Bloqueo\s+SF6', r'Falla\s+(?:MCB|Interna|Carga|canal|alimentación|de\s+equipo)', r'Reserva', r'Manivela\s+(?:Insertada|insertada)', r'Alarma', r'Señal(?:ización)?', r'Nivel\s+(?:de\s+)?(?:Aceite|Temperatura)?', r'Temperatura', r'Buchholz', r'Sobrepresión', r'Relé\s+(?:de\s+Bloqueo|F\d+|K\d+)', r'Protec\.', r'Bloqueo\s+(?:activado|por)', r'Cierre\s+Manual', r'Recepción\s+Teleprotección', r'Transmisión', r'OLTC', r'Ventilador', r'Cuba', r'Registrador\s+de\s+(?:Fallas|fallas)', r'Medidor\s+(?:de\s+Energía|M\d+)', r'Iluminación,', r'--?\d*TT-', r'Controlador\s+de\s+Bahía', r'Mando\s+Sincronizado', r'Alim\.\s+', r'Equipos\s+Secundarios', r'Regulador\s+de\s+Tensión', r'IN\d+-\d+', r'Función\s+\d+', r'Discordancia', r'Resorte\s+descargado', r'K86\s+Relé', r'50BF\s+Arranque', r'Otros\s+seccionadores', r'74\s+Falla', r'Alimentación\s+\d+']
-        pattern = '|'.join(f'({s})' for s in starters)
         def extract_from_line(desc_line):
-            matches = list(re.finditer(pattern, desc_line, re.IGNORECASE))
+            matches = list(_COL_DESC_PAT.finditer(desc_line))
             if not matches:
                 return []
             return [desc_line[m.start():(matches[i+1].start() if i+1 < len(matches) else len(desc_line))].strip() for i, m in enumerate(matches)]
         bi_line_groups = []
         for i, line in enumerate(lines):
-            bi_matches = re.findall(r'BI_(\d+)', line)
+            bi_matches = _BI_PAT.findall(line)
             if bi_matches:
-                group_nums = list(dict.fromkeys(int(m) for m in bi_matches))
+                group_nums = list(dict.fromkeys(int(n) for n in bi_matches))
                 bi_line_groups.append((i, group_nums))
         for bi_line_idx, group_bi_numbers in bi_line_groups:
             num_inputs = len(group_bi_numbers)
             desc_line1, desc_line2 = [], []
             for j in range(max(0, bi_line_idx - 15), bi_line_idx):
                 line = lines[j].strip()
-                if len(line) < 15 or re.match(r'^[/\d\.\-]+[A-H]?\s*F\d+', line) or re.match(r'^-X\d+', line) or re.match(r'^[BP]\d+\s+\d+', line) or re.match(r'^[A-H]\s+[A-H]', line):
+                if len(line) < 15 or _SKIP_LINE_PAT.match(line):
                     continue
                 descs = extract_from_line(line)
                 if descs and len(descs) >= num_inputs:
@@ -386,11 +664,10 @@ class BinaryInputExtractor:
         if not model:
             model, device, function = "PCS-9705S", "-C01", "Controlador de Bahía"
         text = text.replace('\r\n', '\n').replace('\r', '\n')
-        all_bi = re.findall(r'BI_(\d+)', text)
-        if not all_bi:
+        bi_numbers = list(dict.fromkeys(int(n) for n in _BI_PAT.findall(text)))
+        if not bi_numbers:
             return inputs
-        bi_numbers = list(dict.fromkeys(int(m) for m in all_bi))
-        board_match = re.search(r'(B\d{2}|P\d{1,2})\s+\d{2}', text)
+        board_match = _BOARD_PAT.search(text)
         board = board_match.group(1) if board_match else None
         col_desc = self.parse_columnar_descriptions(text, bi_numbers)
         for bi_num in bi_numbers:
@@ -406,10 +683,9 @@ class BinaryInputExtractor:
         if not model:
             model, device, function = "PCS-931S", "-F01", "Protección Primaria PP/1"
         text = text.replace('\r\n', '\n').replace('\r', '\n')
-        all_bi = re.findall(r'BI_(\d+)', text)
-        if not all_bi:
+        bi_numbers = sorted({int(n) for n in _BI_PAT.findall(text)})
+        if not bi_numbers:
             return inputs
-        bi_numbers = sorted(set(int(m) for m in all_bi))
         mapping = {1: 'Interruptor =D.Q01.QA1 (-52-1) - Posición Cerrado - Fase "R,S,T"', 2: 'Interruptor =D.Q01.QA1 (-52-1) - Posición Abierto - Fase "R"', 3: 'Interruptor =D.Q01.QA1 (-52-1) - Posición Abierto - Fase "S"', 4: 'Interruptor =D.Q01.QA1 (-52-1) - Posición Abierto - Fase "T"', 5: 'Interruptor =D.Q01.QA1 (-52-1) - Selector L/R en Remoto', 6: 'Interruptor =D.Q01.QA1 (-52-1) - Selector L/R en Local', 7: 'Interruptor =D.Q01.QA1 (-52-1) - SF6 Bloqueo por Mínima Presión I y II', 8: 'Interruptor =D.Q01.QA1 (-52-1) - Disparo por Discordancia de Polos etapa 1 y 2', 9: 'Interruptor =D.Q01.QA1 (-52-1) - Falla Carga de Resortes, R,S,T', 10: 'Cierre Manual de Interruptor - Arranque SOTF'}
         for bi_num in bi_numbers:
             input_id = f"BI_{bi_num:02d}"
@@ -424,10 +700,9 @@ class BinaryInputExtractor:
         if not model:
             model, device, function = "SEL-411L", "-F02", "Protección Secundaria PS/1"
         text = text.replace('\r\n', '\n').replace('\r', '\n')
-        all_in = re.findall(r'IN(\d+)', text)
-        if not all_in:
+        in_numbers = sorted({int(n) for n in _IN_PAT.findall(text)})
+        if not in_numbers:
             return inputs
-        in_numbers = sorted(set(int(m) for m in all_in))
         mapping = {1: 'Disparo Protec. Primaria de Transformador - Arranque 50BF', 2: 'Disparo Protec. Secundaria de Transformador - Arranque 50BF', 8: 'Interruptor =D.Q01.QA1 (-52-1) - Posición Cerrado - Fase "R,S,T"', 12: 'Reserva'}
         for in_num in in_numbers:
             input_id = f"IN{in_num:02d}"
@@ -437,50 +712,79 @@ class BinaryInputExtractor:
         return inputs
 
     def _is_columnar_bi_page(self, page_num: int, text: str) -> bool:
-        if self._pdf is None or 'BI_' not in text:
+        if not self._has_word_positions or 'BI_' not in text:
             return False
-        if not re.search(r'Circuito de Entradas Binarias de\s+-[A-Z]\d+', text):
+        if 'A B C D E F G H' not in text and ('SLOT:' not in text or not _SLOT_PAT.search(text)):
             return False
-        return 'A B C D E F G H' in text or re.search(r'SLOT:\w+', text)
+        return 'Circuito de Entradas Binarias de' in text and _COLUMNAR_TITLE_PAT.search(text) is not None
+
+    def _classify_device_page(self, text: str) -> PageKind:
+        _, model, _ = self.detect_device_type(text)
+        if model == 'PCS-9705S':
+            return PageKind.PCS9705S
+        if model == 'PCS-931S':
+            return PageKind.PCS931S
+        if model == 'SEL-411L':
+            return PageKind.SEL411L
+        if 'BI_' in text:
+            return PageKind.BI_OTHER
+        if 'IN' in text and _IN_PAT.search(text):
+            return PageKind.IN_OTHER
+        return PageKind.SKIP
+
+    def _classify_page(self, page_num: int, text: str) -> PageKind:
+        if 'Entradas Binarias' not in text and 'Binary Input' not in text:
+            return PageKind.SKIP
+        if 'Índice' in text[:500] or 'Lectura de componentes' in text or 'Esquema general' in text:
+            return PageKind.SKIP
+        if self._is_columnar_bi_page(page_num, text):
+            return PageKind.COLUMNAR_BI
+        return self._classify_device_page(text)
 
-    def extract_all(self) -> List[BinaryInput]:
+    def iter_page_inputs(self, progress_cb: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[int, PageKind, List[BinaryInput]]]:
+        """Yield (page number, page kind, inputs) one page at a time, before cross-page de-duplication.
+
+        progress_cb(pages_done, page_count) is called every few pages while the document is parsed.
+        """
+        self._progress_cb = progress_cb
         if not self.texts and not self.load_archive():
-            return []
+            return
         self._build_device_maps()
-        all_inputs = []
-        processed = set()
-        if self._pdf is not None:
-            for page_num, text in sorted(self.texts.items()):
-                if 'Entradas Binarias' not in text and 'Binary Input' not in text:
-                    continue
-                if 'Índice' in text[:500] or 'Lectura de componentes' in text or 'Esquema general' in text:
-                    continue
-                if self._is_columnar_bi_page(page_num, text):
-                    inputs = self._extract_bi_from_word_positions(page_num)
-                    if inputs:
-                        all_inputs.extend(inputs)
-                        processed.add(page_num)
         for page_num, text in sorted(self.texts.items()):
-            if page_num in processed:
-                continue
-            if 'Entradas Binarias' not in text and 'Binary Input' not in text:
+            kind = self._page_kinds.get(page_num)
+            if kind is None:
+                kind = self._page_kinds[page_num] = self._classify_page(page_num, text)
+            if kind is PageKind.SKIP:
                 continue
-            if 'Índice' in text[:500] or 'Lectura de componentes' in text or 'Esquema general' in text:
-                continue
-            _, model, _ = self.detect_device_type(text)
-            if model == 'PCS-9705S':
+            if kind is PageKind.COLUMNAR_BI:
+                inputs = self._extract_bi_from_word_positions(page_num)
+                if inputs:
+                    yield page_num, kind, inputs
+                    continue
+                kind = self._classify_device_page(text)
+            if kind is PageKind.PCS9705S:
                 inputs = self.extract_pcs9705s_inputs(page_num, text)
-            elif model == 'PCS-931S':
+            elif kind is PageKind.PCS931S:
                 inputs = self.extract_pcs931s_inputs(page_num, text)
-            elif model == 'SEL-411L':
+            elif kind is PageKind.SEL411L:
                 inputs = self.extract_sel411l_inputs(page_num, text)
-            elif 'BI_' in text:
-                inputs = self._extract_bi_from_word_positions(page_num) if self._pdf else self.extract_pcs9705s_inputs(page_num, text)
-            elif re.search(r'IN\d+', text):
+            elif kind is PageKind.BI_OTHER:
+                inputs = self._extract_bi_from_word_positions(page_num) if self._has_word_positions else self.extract_pcs9705s_inputs(page_num, text)
+            elif kind is PageKind.IN_OTHER:
                 inputs = self.extract_sel411l_inputs(page_num, text)
             else:
                 continue
-            all_inputs.extend(inputs)
+            yield page_num, kind, inputs
+
+    def extract_all(self, progress_cb: Optional[Callable[[int, int], None]] = None) -> List[BinaryInput]:
+        # Columnar first, so dedup keeps their entries
+        columnar_inputs, other_inputs = [], []
+        for _, kind, inputs in self.iter_page_inputs(progress_cb):
+            if kind is PageKind.COLUMNAR_BI:
+                columnar_inputs.extend(inputs)
+            else:
+                other_inputs.extend(inputs)
+        all_inputs = columnar_inputs + other_inputs
         dedup = {}
         for inp in all_inputs:
             key = (inp.device, inp.board, inp.input_number)
@@ -494,57 +798,160 @@ class BinaryInputExtractor:
                 self._pdf.close()
             except:
                 pass
+        if self._pdf_map is not None:
+            try:
+                self._pdf_map.close()
+            except:
+                pass
+
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _extract_one(pdf_path: str, index: int = 0, backend: str = 'pdfplumber') -> Tuple[List[BinaryInput], Optional[str]]:
+    """Worker entry point: extract one file and return (inputs, substation name)."""
+    extractor = BinaryInputExtractor(pdf_path, backend)
+    progress_cb = None
+    if _progress_queue is not None:
+        progress_cb = lambda done, total: _progress_queue.put((index, done / total))
+    inputs = extractor.extract_all(progress_cb)
+    return inputs, extractor.substation
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # MULTI-TAB EXCEL WRITER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def write_multi_tab_xlsx(results: Dict[str, List[BinaryInput]], output_path: str) -> bool:
+_XLSX_HEADERS = ['Substation', 'Bay', 'Voltage', 'Switchgear', 'Device', 'Model', 'Function', 'Board/Slot', 'Input_ID', 'Input_Number', 'Description_Line1', 'Description_Line2', 'Full_Description', 'Page']
+_XLSX_COL_WIDTHS = [20, 15, 10, 12, 8, 22, 30, 10, 8, 8, 45, 40, 65, 6]
+
+
+def _sheet_sort_key(inp: BinaryInput) -> Tuple[str, str, int]:
+    return (inp.device, inp.board or '', inp.input_number)
+
+
+@functools.lru_cache(maxsize=None)
+def _xlsx_styles() -> Dict[str, object]:
+    """openpyxl style objects shared by every sheet and every write."""
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    thin = Side(style='thin')
+    return {
+        'hfill': PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        'hfont': Font(name="Arial", bold=True, color="FFFFFF"),
+        'halign': Alignment(horizontal='center'),
+        'dfont': Font(name="Arial"),
+        'border': Border(left=thin, right=thin, top=thin, bottom=thin),
+        'fills': (PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid"), PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")),
+    }
+
+
+def _iter_sheet_rows(inputs: List[BinaryInput]):
+    """Yield (values, fill_index) in sheet order; the fill alternates per device/board group."""
+    prev_key, cidx = None, 0
+    for inp in sorted(inputs, key=_sheet_sort_key):
+        cur = (inp.device, inp.board)
+        if cur != prev_key:
+            if prev_key is not None:
+                cidx = (cidx + 1) % 2
+            prev_key = cur
+        vals = [inp.substation or '', inp.bay or '', inp.voltage_level or '', inp.switchgear or '', inp.device, inp.device_model, inp.device_function, inp.board or '', inp.input_id, inp.input_number, inp.description_line1, inp.description_line2, inp.full_description, inp.page_number]
+        yield vals, cidx
+
+
+def _unique_sheet_names(names: List[str]) -> List[str]:
+    """Valid, distinct sheet names in the same order; Excel compares them case-insensitively."""
+    sheet_names, used = [], set()
+    for name in names:
+        base = _SHEET_NAME_PAT.sub('_', name)[:31] or 'Sheet'
+        sheet_name, n = base, 1
+        while sheet_name.lower() in used:
+            suffix = f"_{n}"
+            sheet_name = base[:31 - len(suffix)] + suffix
+            n += 1
+        used.add(sheet_name.lower())
+        sheet_names.append(sheet_name)
+    return sheet_names
+
+
+def _write_xlsx_openpyxl(sheets: List[Tuple[str, List[BinaryInput]]], output_path: str):
+    openpyxl = _get_openpyxl()
+    WriteOnlyCell = openpyxl.cell.WriteOnlyCell
+    get_column_letter = openpyxl.utils.get_column_letter
+    wb = openpyxl.Workbook(write_only=True)
+    styles = _xlsx_styles()
+    hfill, hfont, halign, dfont, border, fills = styles['hfill'], styles['hfont'], styles['halign'], styles['dfont'], styles['border'], styles['fills']
+    headers, col_widths = _XLSX_HEADERS, _XLSX_COL_WIDTHS
+    last_col = get_column_letter(len(headers))
+    for sheet_name, inputs in sheets:
+        ws = wb.create_sheet(title=sheet_name)
+        for i, w in enumerate(col_widths, 1):
+            ws.column_dimensions[get_column_letter(i)].width = w
+        ws.freeze_panes = 'A2'
+        ws.auto_filter.ref = f"A1:{last_col}{len(inputs) + 1}"
+        header_row = []
+        for h in headers:
+            c = WriteOnlyCell(ws, value=h)
+            c.fill, c.font, c.alignment, c.border = hfill, hfont, halign, border
+            header_row.append(c)
+        ws.append(header_row)
+        for vals, cidx in _iter_sheet_rows(inputs):
+            row = []
+            for v in vals:
+                c = WriteOnlyCell(ws, value=v)
+                c.font, c.fill, c.border = dfont, fills[cidx], border
+                row.append(c)
+            ws.append(row)
+    if not sheets:
+        ws = wb.create_sheet(title="No Data")
+        ws.append(["No binary inputs found in the provided files."])
+    wb.save(output_path)
+
+
+def _write_xlsx_xlsxwriter(sheets: List[Tuple[str, List[BinaryInput]]], output_path: str):
+    xlsxwriter = _get_xlsxwriter()
+    wb = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'use_zip64': True})
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils import get_column_letter
-        wb = Workbook()
-        wb.remove(wb.active)
-        headers = ['Substation', 'Bay', 'Voltage', 'Switchgear', 'Device', 'Model', 'Function', 'Board/Slot', 'Input_ID', 'Input_Number', 'Description_Line1', 'Description_Line2', 'Full_Description', 'Page']
-        hfill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        hfont = Font(name="Arial", bold=True, color="FFFFFF")
-        dfont = Font(name="Arial")
-        border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-        fills = [PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid"), PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")]
-        col_widths = [20, 15, 10, 12, 8, 22, 30, 10, 8, 8, 45, 40, 65, 6]
-        for sheet_name, inputs in results.items():
-            if not inputs:
-                continue
-            safe_name = re.sub(r'[\\/*?:\[\]]', '_', sheet_name)[:31]
-            ws = wb.create_sheet(title=safe_name)
-            sorted_inputs = sorted(inputs, key=lambda x: (x.device, x.board or '', x.input_number))
-            for col, h in enumerate(headers, 1):
-                c = ws.cell(row=1, column=col, value=h)
-                c.fill, c.font, c.alignment, c.border = hfill, hfont, Alignment(horizontal='center'), border
-            prev_key, cidx = None, 0
-            for row, inp in enumerate(sorted_inputs, 2):
-                cur = (inp.device, inp.board)
-                if cur != prev_key:
-                    if prev_key is not None:
-                        cidx = (cidx + 1) % 2
-                    prev_key = cur
-                vals = [inp.substation or '', inp.bay or '', inp.voltage_level or '', inp.switchgear or '', inp.device, inp.device_model, inp.device_function, inp.board or '', inp.input_id, inp.input_number, inp.description_line1, inp.description_line2, inp.full_description, inp.page_number]
-                for col, v in enumerate(vals, 1):
-                    c = ws.cell(row=row, column=col, value=v)
-                    c.font, c.fill, c.border = dfont, fills[cidx], border
-            for i, w in enumerate(col_widths, 1):
-                ws.column_dimensions[get_column_letter(i)].width = w
-            ws.freeze_panes = 'A2'
-            ws.auto_filter.ref = ws.dimensions
-        if not wb.sheetnames:
-            ws = wb.create_sheet(title="No Data")
-            ws.cell(row=1, column=1, value="No binary inputs found in the provided files.")
-        wb.save(output_path)
+        header_fmt = wb.add_format({'font_name': 'Arial', 'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092', 'pattern': 1, 'border': 1, 'align': 'center'})
+        row_fmts = [wb.add_format({'font_name': 'Arial', 'bg_color': color, 'pattern': 1, 'border': 1}) for color in ('#FFFFFF', '#D9E2F3')]
+        for sheet_name, inputs in sheets:
+            ws = wb.add_worksheet(sheet_name)
+            for i, w in enumerate(_XLSX_COL_WIDTHS):
+                ws.set_column(i, i, w)
+            ws.freeze_panes(1, 0)
+            ws.autofilter(0, 0, len(inputs), len(_XLSX_HEADERS) - 1)
+            ws.write_row(0, 0, _XLSX_HEADERS, header_fmt)
+            for row, (vals, cidx) in enumerate(_iter_sheet_rows(inputs), 1):
+                ws.write_row(row, 0, vals, row_fmts[cidx])
+        if not sheets:
+            wb.add_worksheet("No Data").write(0, 0, "No binary inputs found in the provided files.")
+    finally:
+        wb.close()
+
+
+_XLSX_WRITERS = {
+    'openpyxl': _write_xlsx_openpyxl,
+    'xlsxwriter': _write_xlsx_xlsxwriter,
+}
+
+
+def write_multi_tab_xlsx(results: Union[Dict[str, List[BinaryInput]], List[Tuple[str, List[BinaryInput]]]], output_path: str, engine: str = 'openpyxl') -> bool:
+    """Write one sheet per result set with the chosen engine; xlsxwriter falls back to openpyxl when missing."""
+    try:
+        if engine not in _XLSX_WRITERS:
+            raise ValueError(f"Unknown Excel engine '{engine}'. Choose one of: {', '.join(_XLSX_WRITERS)}")
+        if engine == 'xlsxwriter' and not _has_xlsxwriter():
+            engine = 'openpyxl'
+        named = [(name, inputs) for name, inputs in (results.items() if isinstance(results, dict) else results) if inputs]
+        sheets = list(zip(_unique_sheet_names([name for name, _ in named]), (inputs for _, inputs in named)))
+        _XLSX_WRITERS[engine](sheets, output_path)
         return True
-    except ImportError:
-        raise ImportError("openpyxl not installed. Install with: pip install openpyxl")
+    except ImportError as e:
+        raise ImportError(f"{e.name} not installed. Install with: pip install {e.name}")
     except Exception as e:
         raise Exception(f"Error creating Excel file: {e}")
 
@@ -553,15 +960,42 @@ def write_multi_tab_xlsx(results: Dict[str, List[BinaryInput]], output_path: str
 # GUI APPLICATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_LOG_MAX_LINES = 5000
+
+
+def _first_missing(paths: List[str]) -> Optional[str]:
+    """First path that does not exist, listing each directory once."""
+    listings: Dict[str, set] = {}
+    for path in paths:
+        folder, name = os.path.split(os.path.abspath(path))
+        if folder not in listings:
+            try:
+                with os.scandir(folder) as it:
+                    listings[folder] = {e.name for e in it}
+            except OSError:
+                listings[folder] = set()
+        # May still exist on a case-insensitive or network path
+        if name not in listings[folder] and not os.path.exists(path):
+            return path
+    return None
+
+
 class BinaryInputExtractorGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Extractor de Entradas Binarias")
-        self.root.geometry("750x550")
+        self.root.geometry("750x600")
         self.root.resizable(True, True)
         self.pdf_paths = ["", "", ""]
         self.output_path = ""
+        self._ui_queue = queue.Queue()
+        self._pool = None
+        self._progress_queue = None
+        self._job_queue = queue.Queue()
         self._setup_ui()
+        self.root.after(50, self._drain_queues)
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
 
     def _setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="15")
@@ -591,6 +1025,15 @@ class BinaryInputExtractorGUI:
         self.output_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 5))
         ttk.Button(output_row, text="Examinar...", command=self._browse_output).pack(side=tk.LEFT)
         
+        options_frame = ttk.LabelFrame(main_frame, text="Opciones", padding="10")
+        options_frame.pack(fill=tk.X, pady=(0, 15))
+        ttk.Label(options_frame, text="Motor PDF:").pack(side=tk.LEFT)
+        self.backend_var = tk.StringVar(value='pdfplumber')
+        ttk.Combobox(options_frame, textvariable=self.backend_var, values=BinaryInputExtractor.BACKENDS, state='readonly', width=12).pack(side=tk.LEFT, padx=(5, 20))
+        ttk.Label(options_frame, text="Motor Excel:").pack(side=tk.LEFT)
+        self.engine_var = tk.StringVar(value='openpyxl')
+        ttk.Combobox(options_frame, textvariable=self.engine_var, values=list(_XLSX_WRITERS), state='readonly', width=12).pack(side=tk.LEFT, padx=(5, 0))
+        
         progress_frame = ttk.Frame(main_frame)
         progress_frame.pack(fill=tk.X, pady=(0, 15))
         self.progress_var = tk.DoubleVar()
@@ -618,9 +1061,10 @@ class BinaryInputExtractorGUI:
         if filepath:
             self.pdf_entries[index].delete(0, tk.END)
             self.pdf_entries[index].insert(0, filepath)
-            self._log(f"Seleccionado PDF {index + 1}: {Path(filepath).name}")
+            path = Path(filepath)
+            self._log(f"Seleccionado PDF {index + 1}: {path.name}")
             if not self.output_entry.get():
-                self.output_entry.insert(0, str(Path(filepath).parent / "entradas_binarias_resultado.xlsx"))
+                self.output_entry.insert(0, str(path.parent / "entradas_binarias_resultado.xlsx"))
 
     def _clear_pdf(self, index):
         self.pdf_entries[index].delete(0, tk.END)
@@ -632,76 +1076,181 @@ class BinaryInputExtractorGUI:
             self.output_entry.insert(0, filepath)
 
     def _log(self, message):
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        self._ui_queue.put((None, message))
+
+    def _post(self, fn, *args):
+        """Run fn on the Tk thread; worker threads never touch widgets or the interpreter."""
+        if threading.current_thread() is threading.main_thread():
+            fn(*args)
+        else:
+            self._ui_queue.put((fn, args))
+
+    def _write_log(self, lines):
+        if lines:
+            self.log_text.insert(tk.END, ''.join(f"{m}\n" for m in lines))
+            self.log_text.delete('1.0', f'end - {_LOG_MAX_LINES} lines')
+            self.log_text.see(tk.END)
+
+    def _drain_queues(self):
+        try:
+            lines = []
+            while True:
+                try:
+                    fn, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if fn is None:
+                    lines.append(args)
+                    continue
+                self._write_log(lines)
+                lines = []
+                fn(*args)
+            self._write_log(lines)
+        finally:
+            self.root.after(50, self._drain_queues)
 
     def _update_status(self, message, progress=None):
+        self._post(self._set_status, message, progress)
+
+    def _set_status(self, message, progress):
         self.status_var.set(message)
         if progress is not None:
             self.progress_var.set(progress)
-        self.root.update_idletasks()
 
     def _start_extraction(self):
-        pdf_files = [e.get().strip() for e in self.pdf_entries if e.get().strip()]
+        pdf_files = [path for path in (e.get().strip() for e in self.pdf_entries) if path]
         if not pdf_files:
             messagebox.showerror("Error", "Por favor seleccione al menos un archivo PDF.")
             return
+        seen, unique_files, duplicates = set(), [], []
+        for pdf in pdf_files:
+            key = os.path.normcase(os.path.abspath(pdf))
+            if key in seen:
+                duplicates.append(pdf)
+            else:
+                seen.add(key)
+                unique_files.append(pdf)
+        pdf_files = unique_files
         output_path = self.output_entry.get().strip()
         if not output_path:
             messagebox.showerror("Error", "Por favor especifique la ruta del archivo de salida.")
             return
-        for pdf in pdf_files:
-            if not os.path.exists(pdf):
-                messagebox.showerror("Error", f"Archivo no encontrado: {pdf}")
-                return
+        missing = _first_missing(pdf_files)
+        if missing is not None:
+            messagebox.showerror("Error", f"Archivo no encontrado: {missing}")
+            return
         self.extract_btn.configure(state='disabled')
-        self.log_text.delete(1.0, tk.END)
-        threading.Thread(target=self._run_extraction, args=(pdf_files, output_path)).start()
+        # Queued, so lines already waiting are cleared too
+        self._ui_queue.put((self.log_text.delete, ('1.0', tk.END)))
+        for pdf in duplicates:
+            self._log(f"⚠ Archivo repetido, se procesa una sola vez: {pdf}")
+        self._job_queue.put((pdf_files, output_path, self.backend_var.get(), self.engine_var.get()))
+
+    def _worker_loop(self):
+        while True:
+            job = self._job_queue.get()
+            if job is None:
+                break
+            self._run_extraction(*job)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Process pool shared by every run of the session."""
+        if self._pool is None:
+            ctx = multiprocessing.get_context('spawn')
+            self._progress_queue = ctx.Queue()
+            self._pool = ProcessPoolExecutor(max_workers=min(len(self.pdf_entries), os.cpu_count() or 1), mp_context=ctx, initializer=_init_worker, initargs=(self._progress_queue,))
+        return self._pool
+
+    def _discard_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
-    def _run_extraction(self, pdf_files, output_path):
+    def _submit_all(self, pdf_files: List[str], backend: str) -> Dict[object, int]:
+        """Submit every file; a pool whose idle worker died since the last run is replaced once."""
+        for attempt in range(2):
+            pool = self._get_pool()
+            self._drain_progress()
+            try:
+                return {pool.submit(_extract_one, p, i, backend): i for i, p in enumerate(pdf_files)}
+            except BrokenProcessPool:
+                self._discard_pool()
+                if attempt:
+                    raise
+
+    def _drain_progress(self) -> List[Tuple[int, float]]:
+        updates = []
+        while True:
+            try:
+                updates.append(self._progress_queue.get_nowait())
+            except queue.Empty:
+                return updates
+
+    def shutdown(self):
+        self._job_queue.put(None)
+        self._worker.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def _run_extraction(self, pdf_files, output_path, backend='pdfplumber', engine='openpyxl'):
         try:
-            results = {}
-            for i, pdf_path in enumerate(pdf_files):
-                filename = Path(pdf_path).stem
-                self._update_status(f"Procesando {filename}...", (i / len(pdf_files)) * 100)
-                self._log(f"\n{'='*50}\nProcesando: {filename}")
-                try:
-                    extractor = BinaryInputExtractor(pdf_path)
-                    inputs = extractor.extract_all()
-                    if inputs:
-                        results[filename[:31]] = inputs
-                        self._log(f"✓ Encontradas {len(inputs)} entradas binarias")
-                        if extractor.substation:
-                            self._log(f"  Subestación: {extractor.substation}")
-                        devices = {}
-                        for inp in inputs:
-                            key = f"{inp.device} ({inp.device_model})"
-                            devices[key] = devices.get(key, 0) + 1
-                        for dev, count in devices.items():
-                            self._log(f"  - {dev}: {count} entradas")
-                    else:
-                        self._log("⚠ No se encontraron entradas binarias")
-                except Exception as e:
-                    self._log(f"✗ Error: {str(e)}")
+            found = {}
+            total_files = len(pdf_files)
+            filenames = [Path(p).stem for p in pdf_files]
+            self._update_status(f"Procesando {total_files} archivo(s)...", 0)
+            futures = self._submit_all(pdf_files, backend)
+            fractions = [0.0] * total_files
+            pending, done = set(futures), 0
+            while pending:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for i, fraction in self._drain_progress():
+                    fractions[i] = max(fractions[i], fraction)
+                if not finished:
+                    self._post(self.progress_var.set, sum(fractions) / total_files * 90)
+                    continue
+                for future in sorted(finished, key=futures.get):
+                    done += 1
+                    i = futures[future]
+                    fractions[i] = 1.0
+                    filename = filenames[i]
+                    self._update_status(f"Procesado {filename} ({done}/{total_files})", sum(fractions) / total_files * 90)
+                    self._log(f"\n{'='*50}\nProcesado: {filename}")
+                    try:
+                        inputs, substation = future.result()
+                        if inputs:
+                            found[i] = inputs
+                            self._log(f"✓ Encontradas {len(inputs)} entradas binarias")
+                            if substation:
+                                self._log(f"  Subestación: {substation}")
+                            devices = Counter(f"{inp.device} ({inp.device_model})" for inp in inputs)
+                            for dev, count in devices.most_common():
+                                self._log(f"  - {dev}: {count} entradas")
+                        else:
+                            self._log("⚠ No se encontraron entradas binarias")
+                    except BrokenProcessPool as e:
+                        self._discard_pool()
+                        self._log(f"✗ Error: {str(e)}")
+                    except Exception as e:
+                        self._log(f"✗ Error: {str(e)}")
+            results = [(filenames[i], found[i]) for i in sorted(found)]
             if results:
                 self._update_status("Generando Excel...", 90)
                 self._log(f"\n{'='*50}\nGuardando en: {output_path}")
-                write_multi_tab_xlsx(results, output_path)
-                total = sum(len(v) for v in results.values())
+                write_multi_tab_xlsx(results, output_path, engine)
+                total = sum(len(inputs) for _, inputs in results)
                 self._update_status("¡Completado!", 100)
                 self._log(f"\n✓ Excel creado: {len(results)} pestaña(s), {total} entradas")
-                self.root.after(0, lambda: messagebox.showinfo("Éxito", f"¡Extracción completada!\n\n{output_path}\n\n{len(results)} pestaña(s), {total} entradas binarias."))
+                self._post(messagebox.showinfo, "Éxito", f"¡Extracción completada!\n\n{output_path}\n\n{len(results)} pestaña(s), {total} entradas binarias.")
             else:
                 self._update_status("Sin datos", 100)
                 self._log("\n⚠ No se encontraron entradas binarias")
-                self.root.after(0, lambda: messagebox.showwarning("Advertencia", "No se encontraron entradas binarias."))
+                self._post(messagebox.showwarning, "Advertencia", "No se encontraron entradas binarias.")
         except Exception as e:
             self._update_status("Error", 0)
             self._log(f"\n✗ Error: {str(e)}")
-            self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
+            self._post(messagebox.showerror, "Error", str(e))
         finally:
-            self.root.after(0, lambda: self.extract_btn.configure(state='normal'))
+            self._post(lambda: self.extract_btn.configure(state='normal'))
 
 
 def main():
@@ -712,9 +1261,11 @@ def main():
             style.theme_use('clam')
     except:
         pass
-    BinaryInputExtractorGUI(root)
+    app = BinaryInputExtractorGUI(root)
     root.mainloop()
+    app.shutdown()
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()